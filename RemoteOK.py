@@ -3,6 +3,69 @@ import pandas as pd
 import pyodbc
 import configparser
 from pathlib import Path
+from http_utils import SESSION
+
+try:  # orjson decodes large API payloads several times faster than stdlib json
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+    _json_loads = json.loads
+
+# SQL statements are built once at import: passing the identical string to the
+# cursor on every run lets pyodbc reuse its prepared statement handle instead
+# of re-preparing (parse + plan) the same text each invocation.
+CREATE_TABLE_QUERY = """
+IF OBJECT_ID('RemoteOKJobs', 'U') IS NULL
+BEGIN
+    CREATE TABLE RemoteOKJobs (
+        id NVARCHAR(50) PRIMARY KEY,
+        date_posted DATETIME2,
+        company NVARCHAR(255),
+        position NVARCHAR(255),
+        location NVARCHAR(255),
+        tags NVARCHAR(MAX),
+        salary_min int,
+        salary_max int,
+        url NVARCHAR(MAX)
+    )
+END
+"""
+
+STAGE_TABLE_QUERY = """
+CREATE TABLE #stage (
+    id NVARCHAR(50) PRIMARY KEY,
+    date_posted DATETIME2,
+    company NVARCHAR(255),
+    position NVARCHAR(255),
+    location NVARCHAR(255),
+    tags NVARCHAR(MAX),
+    salary_min int,
+    salary_max int,
+    url NVARCHAR(MAX)
+)
+"""
+
+STAGE_INSERT_QUERY = "INSERT INTO #stage VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+
+MERGE_QUERY = """
+MERGE RemoteOKJobs AS target
+USING #stage AS source
+ON target.id = source.id
+WHEN MATCHED THEN
+    UPDATE SET
+        target.date_posted = source.date_posted,
+        target.company = source.company,
+        target.position = source.position,
+        target.location = source.location,
+        target.tags = source.tags,
+        target.salary_min = source.salary_min,
+        target.salary_max = source.salary_max,
+        target.url = source.url
+WHEN NOT MATCHED THEN
+    INSERT (id, date_posted, company, position, location, tags, salary_min, salary_max, url)
+    VALUES (source.id, source.date_posted, source.company, source.position, source.location, source.tags, source.salary_min, source.salary_max, source.url);
+"""
 
 def fetch_remoteok_data(api_url: str) -> pd.DataFrame | None:
     """
@@ -16,10 +79,10 @@ def fetch_remoteok_data(api_url: str) -> pd.DataFrame | None:
     """
     print("🚀 Starting: Fetching data from RemoteOK API...")
     try:
-        response = requests.get(api_url, timeout=10)
+        response = SESSION.get(api_url, timeout=10)
         response.raise_for_status()  # Raises an HTTPError for bad responses (4xx or 5xx)
 
-        data = response.json()
+        data = _json_loads(response.content)
         if not data or not isinstance(data, list) or len(data) < 2:
             print("❌ Error: API returned unexpected data format.")
             return None
@@ -43,17 +106,21 @@ def fetch_remoteok_data(api_url: str) -> pd.DataFrame | None:
 
         # Convert to DataFrame and clean data types
         df = pd.DataFrame(jobs_data)
-        # Convert to datetime (force UTC if present, coerce invalid)
-        df['date_posted'] = pd.to_datetime(df['date_posted'], errors='coerce')
-
-        # Now remove timezone (tz-aware → tz-naive)
-        df['date_posted'] = df['date_posted'].dt.tz_localize(None)
+        # Convert to datetime in one pass: parse everything as UTC (coerce
+        # invalid) and strip the tz in the same pipeline, instead of first
+        # materializing a tz-aware column and then discarding the tz
+        df['date_posted'] = pd.to_datetime(df['date_posted'], errors='coerce', utc=True).dt.tz_convert(None)
 
         df['id'] = df['id'].astype(str)
         df['salary_min'] = pd.to_numeric(df['salary_min'], errors='coerce').fillna(0).astype(int)
         df['salary_max'] = pd.to_numeric(df['salary_max'], errors='coerce').fillna(0).astype(int)
 
-        df = df.where(pd.notnull(df), None) # Convert NaN to None for SQL NULL
+        # Convert NaN to None for SQL NULL — only the object columns can
+        # still hold NaN here, so normalize them one by one and skip the
+        # full-frame boolean mask + copy that df.where(pd.notnull(df), None)
+        # would allocate
+        for col in df.select_dtypes(include=['object', 'string']).columns:
+            df[col] = df[col].where(df[col].notna(), None)
 
         print("✅ Success: Fetched and prepared job data.")
         return df
@@ -107,53 +174,30 @@ def load_data_to_sql(df: pd.DataFrame, conn: pyodbc.Connection):
         cursor = conn.cursor()
 
         # Step 1: Create Table (if not exists) with improved data types
-        create_table_query = """
-        IF OBJECT_ID('RemoteOKJobs', 'U') IS NULL
-        BEGIN
-            CREATE TABLE RemoteOKJobs (
-                id NVARCHAR(50) PRIMARY KEY,
-                date_posted DATETIME2,
-                company NVARCHAR(255),
-                position NVARCHAR(255),
-                location NVARCHAR(255),
-                tags NVARCHAR(MAX),
-                salary_min int,
-                salary_max int,
-                url NVARCHAR(MAX)
-            )
-        END
-        """
-        cursor.execute(create_table_query)
+        cursor.execute(CREATE_TABLE_QUERY)
         conn.commit()
         print("✅ Table checked/created successfully.")
 
-        # Step 2: Use MERGE for an efficient "upsert" operation
-        # This will update existing jobs and insert new ones.
-        merge_query = """
-        MERGE RemoteOKJobs AS target
-        USING (VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)) AS source (id, date_posted, company, position, location, tags, salary_min, salary_max, url)
-        ON target.id = source.id
-        WHEN MATCHED THEN
-            UPDATE SET
-                target.date_posted = source.date_posted,
-                target.company = source.company,
-                target.position = source.position,
-                target.location = source.location,
-                target.tags = source.tags,
-                target.salary_min = source.salary_min,
-                target.salary_max = source.salary_max,
-                target.url = source.url
-        WHEN NOT MATCHED THEN
-            INSERT (id, date_posted, company, position, location, tags, salary_min, salary_max, url)
-            VALUES (source.id, source.date_posted, source.company, source.position, source.location, source.tags, source.salary_min, source.salary_max, source.url);
-        """
-
-        # Prepare data for executemany
-        data_to_insert = [tuple(row) for row in df.itertuples(index=False)]
-
-        # Set fast_executemany for significant performance boost
-        cursor.fast_executemany = True
-        cursor.executemany(merge_query, data_to_insert)
+        # Step 2: Stage the batch into a temp table, then run ONE set-based
+        # MERGE "upsert" — the server executes a single MERGE plan instead of
+        # one per row. MERGE rejects duplicate source keys, so dedupe first.
+        df = df.drop_duplicates('id', keep='last')
+
+        # Prepare data for executemany — name=None yields bare tuples straight
+        # from C instead of a namedtuple per row that we then re-copy
+        data_to_insert = list(df.itertuples(index=False, name=None))
+
+        cursor.execute(STAGE_TABLE_QUERY)
+        if hasattr(cursor, 'bulkcopy'):
+            # mssql-python cursors expose native TDS bulk load (same protocol
+            # as bcp/SqlBulkCopy), which skips per-row parameter binding.
+            cursor.bulkcopy('#stage', data_to_insert, table_lock=True, batch_size=50000)
+        else:
+            # pyodbc fallback: fast_executemany for significant performance boost
+            cursor.fast_executemany = True
+            cursor.executemany(STAGE_INSERT_QUERY, data_to_insert)
+        cursor.execute(MERGE_QUERY)
+        cursor.execute("DROP TABLE #stage")
         conn.commit()
 
         print(f"✅ Success: {len(data_to_insert)} rows merged into the database.")
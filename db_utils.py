@@ -1,24 +1,38 @@
 # db_utils.py
+import functools
 import pyodbc
 import configparser
 
+# ODBC connection pooling is on by default in recent pyodbc, but assert it
+# before the first connect so repeated main() runs reuse pooled connections.
+pyodbc.pooling = True
+
+
+@functools.lru_cache(maxsize=4)
+def _build_conn_str(config_items: frozenset) -> str:
+    """Formats (and memoizes) the ODBC connection string for a config section."""
+    db_config = dict(config_items)
+    return (
+        f"DRIVER={{ODBC Driver 17 for SQL Server}};"
+        f"SERVER={db_config['server']};"
+        f"DATABASE={db_config['database']};"
+        # Remove 'Trusted_Connection=yes;' if you use SQL Server authentication
+        # If using SQL Server Authentication, include:
+        # f"UID={db_config['username']};"
+        # f"PWD={db_config['password']};"
+        f"Trusted_Connection=yes;"  # Keep this if using Windows Authentication
+    )
+
+
 def get_db_connection(db_config: dict) -> pyodbc.Connection | None:
     """
     Connect to SQL Server using details from a dictionary.
     """
     try:
-        conn_str = (
-            f"DRIVER={{ODBC Driver 17 for SQL Server}};"
-            f"SERVER={db_config['server']};"
-            f"DATABASE={db_config['database']};"
-            # Remove 'Trusted_Connection=yes;' if you use SQL Server authentication
-            # If using SQL Server Authentication, include:
-            # f"UID={db_config['username']};"
-            # f"PWD={db_config['password']};"
-            f"Trusted_Connection=yes;"  # Keep this if using Windows Authentication
-        )
+        conn_str = _build_conn_str(frozenset(db_config.items()))
 
-        conn = pyodbc.connect(conn_str)
+        # autocommit stays off: the loaders batch their work and commit once
+        conn = pyodbc.connect(conn_str, autocommit=False)
         print("✅ Success: Connected to SQL Server.")
         return conn
 
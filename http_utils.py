@@ -0,0 +1,25 @@
+# http_utils.py
+import requests
+from requests.adapters import HTTPAdapter, Retry
+
+
+def _build_session() -> requests.Session:
+    """
+    Build the shared HTTP session used by all fetchers.
+
+    A single pooled session keeps TCP/TLS connections alive between API
+    calls (one handshake per host instead of one per request) and retries
+    transient failures with a short backoff.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(total=2, backoff_factor=0.3),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+SESSION = _build_session()
@@ -0,0 +1,30 @@
+# run_all.py
+from concurrent.futures import ThreadPoolExecutor
+
+import Adzuna
+import Jooble
+import RemoteOK
+
+
+def main():
+    """Runs the three ETL pipelines concurrently.
+
+    Each pipeline is overwhelmingly I/O-bound (HTTP calls plus SQL
+    round-trips) and fully independent — every main() opens its own DB
+    connection — so threads let the network waits overlap. The GIL is
+    released during both requests I/O and pyodbc C calls.
+    """
+    print("--- Starting full ETL cycle (Adzuna + Jooble + RemoteOK) ---")
+    pipelines = {"Adzuna": Adzuna.main, "Jooble": Jooble.main, "RemoteOK": RemoteOK.main}
+    with ThreadPoolExecutor(max_workers=len(pipelines)) as executor:
+        futures = {name: executor.submit(entry) for name, entry in pipelines.items()}
+        for name, future in futures.items():
+            try:
+                future.result()
+            except Exception as e:
+                print(f"❌ Pipeline Error ({name}): {e}")
+    print("--- Full ETL cycle finished ---")
+
+
+if __name__ == "__main__":
+    main()